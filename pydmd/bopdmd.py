@@ -16,14 +16,13 @@ from collections import OrderedDict
 from inspect import isfunction
 
 import numpy as np
-from scipy.linalg import qr
+from scipy.linalg import qr, solve_triangular
 from scipy.sparse import csr_matrix
-import matplotlib.pyplot as plt
 
 from .dmdbase import DMDBase
 from .dmdoperator import DMDOperator
 from .snapshots import Snapshots
-from .utils import compute_rank, compute_svd
+from .utils import _compute_rank, compute_rank, compute_svd
 
 
 class BOPDMDOperator(DMDOperator):
@@ -161,6 +160,9 @@ class BOPDMDOperator(DMDOperator):
         self._use_proj = use_proj
         self._init_alpha = init_alpha
         self._proj_basis = proj_basis
+        # Hermitian transpose of the projection basis, used as the projector
+        # by every trial. Computed once to avoid re-conjugating the basis.
+        self._proj_basis_H = proj_basis.conj().T
         self._num_trials = num_trials
         self._trial_size = trial_size
         self._eig_sort = eig_sort
@@ -390,6 +392,23 @@ class BOPDMDOperator(DMDOperator):
             (A, (np.arange(m), np.full(m, fill_value=i))), shape=(m, n)
         )
 
+    def _exp_function_deriv_batch(self, alpha, t):
+        """
+        All derivatives of the matrix of exponentials at once. Since the
+        derivative of Phi(alpha, t) with respect to alpha[i] is only nonzero
+        in its ith column, all derivatives may be stored in a single matrix.
+
+        :param alpha: Vector of time scalings in the exponent.
+        :type alpha: numpy.ndarray
+        :param t: Vector of time values.
+        :type t: numpy.ndarray
+        :return: Matrix D such that D[:, i] is the ith column of the
+            derivative of Phi(alpha, t) with respect to alpha[i], i.e.
+            D[j, i] = t_j * exp(t_j * alpha_i).
+        :rtype: numpy.ndarray
+        """
+        return t[:, None] * np.exp(np.outer(t, alpha))
+
     @staticmethod
     def _compute_irank_svd(X, tolrank):
         """
@@ -406,7 +425,7 @@ class BOPDMDOperator(DMDOperator):
         :rtype: numpy.ndarray, numpy.ndarray, numpy.ndarray
         """
         U, s, Vh = np.linalg.svd(X, full_matrices=False)
-        irank = np.sum(s > tolrank * s[0])
+        irank = np.count_nonzero(s > tolrank * s[0])
         U = U[:, :irank]
         S = np.diag(s[:irank])
         Vh = Vh[:irank]
@@ -493,14 +512,16 @@ class BOPDMDOperator(DMDOperator):
             )
             raise ValueError(msg)
 
-        # Obtain and return subset of the data.
-        all_inds = np.arange(H.shape[0])
+        # Obtain and return subset of the data. Sampling from the population
+        # size directly draws the same indices as sampling from arange(m).
         subset_inds = np.sort(
-            np.random.choice(all_inds, size=batch_size, replace=False)
+            np.random.choice(H.shape[0], size=batch_size, replace=False)
         )
         return H[subset_inds], subset_inds
 
-    def _variable_projection(self, H, t, init_alpha, Phi, dPhi):
+    def _variable_projection(
+        self, H, t, init_alpha, Phi, dPhi, dPhi_batch=None, init_phi=None
+    ):
         """
         Variable projection routine for multivariate data.
         Attempts to fit the columns of H as linear combinations of the columns
@@ -520,6 +541,16 @@ class BOPDMDOperator(DMDOperator):
         :param dPhi: (M, N) matrix-valued function dPhi(alpha,t,i) that
             contains the derivatives of Phi wrt the ith component of alpha.
         :type dPhi: function
+        :param dPhi_batch: optional (M, N) matrix-valued function
+            dPhi_batch(alpha,t) whose ith column is the ith column of
+            dPhi(alpha,t,i). Only valid if dPhi(alpha,t,i) is nonzero in its
+            ith column alone, in which case the full Jacobian is assembled
+            without looping over the components of alpha.
+        :type dPhi_batch: function
+        :param init_phi: optional precomputed (M, N) matrix Phi(init_alpha,t).
+            Ignored if eigenvalue constraints are enforced, as init_alpha is
+            then modified before Phi is first evaluated.
+        :type init_phi: numpy.ndarray
         :return: Tuple of two numpy arrays and a boolean representing:
             1. (N, IS) best-fit matrix B.
             2. (N,) best-fit vector alpha.
@@ -553,85 +584,151 @@ class BOPDMDOperator(DMDOperator):
             verbose,
         ) = self._varpro_opts
 
-        def compute_error(B, alpha):
+        H_norm = np.linalg.norm(H, "fro")
+
+        # Resolve the eigenvalue constraints and the mode proximal operator
+        # once, rather than at every evaluation within the iterations below.
+        if self._eig_constraints:
+            push_eigenvalues = self._push_eigenvalues
+        else:
+            push_eigenvalues = None
+        if not self._use_proj:
+            mode_prox = self._mode_prox
+        else:
+            mode_prox = None
+
+        def compute_error(B, phi_alpha):
             """
-            Compute the current residual, objective, and relative error.
+            Compute the current residual, objective, and relative error,
+            given the matrix phi_alpha = Phi(alpha, t) for the current alpha.
             """
-            residual = H - Phi(alpha, t).dot(B)
-            objective = 0.5 * np.linalg.norm(residual, "fro") ** 2
-            error = np.linalg.norm(residual, "fro") / np.linalg.norm(H, "fro")
+            residual = phi_alpha.dot(B)
+            np.subtract(H, residual, out=residual)
+            residual_norm2 = np.vdot(residual, residual).real
+            objective = 0.5 * residual_norm2
+            error = np.sqrt(residual_norm2) / H_norm
 
             return residual, objective, error
 
-        def compute_B(alpha):
+        def compute_B(phi_alpha):
             """
-            Update B for the current alpha.
+            Update B for the current alpha, given the matrix
+            phi_alpha = Phi(alpha, t).
             """
-            # Compute B using least squares.
-            B = np.linalg.lstsq(Phi(alpha, t), H, rcond=None)[0]
+            # Compute B using least squares, via the QR factorization of
+            # phi_alpha. Fall back to lstsq if phi_alpha has fewer rows than
+            # columns (e.g. small bags) or if it is rank-deficient.
+            B = None
+            if phi_alpha.shape[0] >= phi_alpha.shape[1]:
+                q_phi, r_phi = qr(
+                    phi_alpha, mode="economic", check_finite=False
+                )
+                r_diag = np.abs(np.diag(r_phi))
+                if r_diag.min() > tolrank * r_diag.max():
+                    B = solve_triangular(
+                        r_phi, q_phi.conj().T.dot(H), check_finite=False
+                    )
+            if B is None:
+                B = np.linalg.lstsq(phi_alpha, H, rcond=None)[0]
 
             # Apply proximal operator if given, and if data isn't projected.
-            if self._mode_prox is not None and not self._use_proj:
-                B = self._mode_prox(B)
+            if mode_prox is not None:
+                B = mode_prox(B)
 
             return B
 
         # Initialize values.
         _lambda = init_lambda
-        alpha = self._push_eigenvalues(init_alpha)
-        B = compute_B(alpha)
-        U, S, Vh = self._compute_irank_svd(Phi(alpha, t), tolrank)
+        alpha = init_alpha
+        if push_eigenvalues is not None:
+            alpha = push_eigenvalues(alpha)
+            phi_alpha = Phi(alpha, t)
+        elif init_phi is not None:
+            phi_alpha = init_phi
+        else:
+            phi_alpha = Phi(alpha, t)
+        B = compute_B(phi_alpha)
+        U, S, Vh = self._compute_irank_svd(phi_alpha, tolrank)
 
         # Initialize termination flags.
         converged = False
         stalled = False
 
         # Initialize storage.
-        all_error = np.zeros(maxiter)
-        djac_matrix = np.zeros((M * IS, IA), dtype="complex")
-        rjac = np.zeros((2 * IA, IA), dtype="complex")
-        scales = np.zeros(IA)
+        djac_matrix = np.zeros((M * IS, IA), dtype="complex", order="F")
+        rjac = np.zeros((2 * IA, IA), dtype="complex", order="F")
+        # Indices of the diagonal of the bottom (IA, IA) block of rjac.
+        # The rest of the bottom block is never written, so it stays zero.
+        rjac_diag_inds = (np.arange(IA, 2 * IA), np.arange(IA))
+        # Right-hand side of the augmented system solved by rjac. Likewise,
+        # only its top half is written at each iteration.
+        rhs = np.zeros(2 * IA, dtype="complex")
+
+        # The Levenberg algorithm uses unit scales at every iteration.
+        if not use_levmarq:
+            scales = np.ones(IA)
 
         # Initialize iteration progress indicators.
-        residual, objective, error = compute_error(B, alpha)
+        residual, objective, error = compute_error(B, phi_alpha)
+        # Only the error of the previous iteration is needed to detect stalls.
+        prev_error = error
 
         for itr in range(maxiter):
-            # Build Jacobian matrix, looping over alpha indices.
-            for i in range(IA):
-                # Build the approximate expression for the Jacobian.
-                dphi_temp = dPhi(alpha, t, i)
-                ut_dphi = csr_matrix(U.conj().T @ dphi_temp)
-                uut_dphi = csr_matrix(U @ ut_dphi)
-                djac_a = (dphi_temp - uut_dphi) @ B
-                djac_matrix[:, i] = djac_a.ravel(order="F")
+            if use_fulljac:
+                # S is diagonal, so U S^{-1} Vh amounts to scaling U.
+                transform = (U / np.diag(S)).dot(Vh)
+
+            if dPhi_batch is not None:
+                # Build the Jacobian matrix for all alpha indices at once.
+                # Column i of the Jacobian is given by the outer product of
+                # the ith column of dPhi_batch and the ith row of B.
+                dphi_all = dPhi_batch(alpha, t)
+                dphi_perp = dphi_all - U @ (U.conj().T @ dphi_all)
+                # Since djac_matrix is stored in Fortran order, we may write
+                # the (IA, IS, M) tensor of columns into it directly.
+                djac_tensor = djac_matrix.T.reshape(IA, IS, M)
+                np.einsum("mk,kn->knm", dphi_perp, B, out=djac_tensor)
 
                 # Compute the full expression for the Jacobian.
                 if use_fulljac:
-                    transform = np.linalg.multi_dot([U, np.linalg.inv(S), Vh])
-                    dphit_res = csr_matrix(dphi_temp.conj().T @ residual)
-                    djac_b = transform @ dphit_res
-                    djac_matrix[:, i] += djac_b.ravel(order="F")
-
-                # Scale for the Levenberg algorithm.
-                scales[i] = 1
-                # Scale for the Levenberg-Marquardt algorithm.
-                if use_levmarq:
-                    scales[i] = min(np.linalg.norm(djac_matrix[:, i]), 1)
-                    scales[i] = max(scales[i], 1e-6)
+                    dphit_res = dphi_all.conj().T @ residual
+                    djac_tensor += np.einsum("mk,kn->knm", transform, dphit_res)
+            else:
+                # Build Jacobian matrix, looping over alpha indices.
+                for i in range(IA):
+                    # Build the approximate expression for the Jacobian.
+                    dphi_temp = dPhi(alpha, t, i)
+                    ut_dphi = csr_matrix(U.conj().T @ dphi_temp)
+                    uut_dphi = csr_matrix(U @ ut_dphi)
+                    djac_a = (dphi_temp - uut_dphi) @ B
+                    djac_matrix[:, i] = djac_a.ravel(order="F")
+
+                    # Compute the full expression for the Jacobian.
+                    if use_fulljac:
+                        dphit_res = csr_matrix(dphi_temp.conj().T @ residual)
+                        djac_b = transform @ dphit_res
+                        djac_matrix[:, i] += djac_b.ravel(order="F")
+
+            # Scale for the Levenberg-Marquardt algorithm.
+            if use_levmarq:
+                scales = np.clip(np.linalg.norm(djac_matrix, axis=0), 1e-6, 1.0)
 
             # Loop to determine lambda (the step-size parameter).
-            rhs_temp = np.copy(residual.ravel(order="F"))[:, None]
+            rhs_temp = residual.ravel(order="F")[:, None]
+            djac_rhs = djac_matrix.conj().T.dot(rhs_temp)
             q_out, djac_out, j_pvt = qr(
-                djac_matrix, mode="economic", pivoting=True
+                djac_matrix,
+                overwrite_a=True,
+                mode="economic",
+                pivoting=True,
+                check_finite=False,
             )
             ij_pvt = np.arange(IA)
             ij_pvt = ij_pvt[j_pvt]
             rjac[:IA] = np.triu(djac_out[:IA])
             rhs_top = q_out.conj().T.dot(rhs_temp)
             scales_pvt = scales[j_pvt[:IA]]
-            rhs = np.concatenate(
-                (rhs_top[:IA], np.zeros(IA, dtype="complex")), axis=None
-            )
+            rhs[:IA] = rhs_top[:IA, 0]
 
             def step(_lambda, scales_pvt=scales_pvt, rhs=rhs, ij_pvt=ij_pvt):
                 """
@@ -639,44 +736,42 @@ class BOPDMDOperator(DMDOperator):
                 computes and returns the updated step and alpha vectors.
                 """
                 # Compute the step delta.
-                rjac[IA:] = _lambda * np.diag(scales_pvt)
+                rjac[rjac_diag_inds] = _lambda * scales_pvt
                 delta = np.linalg.lstsq(rjac, rhs, rcond=None)[0]
                 delta = delta[ij_pvt]
 
                 # Compute the updated alpha vector.
                 alpha_updated = alpha.ravel() + delta.ravel()
-                alpha_updated = self._push_eigenvalues(alpha_updated)
+                if push_eigenvalues is not None:
+                    alpha_updated = push_eigenvalues(alpha_updated)
 
                 return delta, alpha_updated
 
             # Take a step using our initial step size init_lambda.
             delta_0, alpha_0 = step(_lambda)
-            B_0 = compute_B(alpha_0)
-            residual_0, objective_0, error_0 = compute_error(B_0, alpha_0)
+            phi_alpha_0 = Phi(alpha_0, t)
+            B_0 = compute_B(phi_alpha_0)
+            residual_0, objective_0, error_0 = compute_error(B_0, phi_alpha_0)
 
             # Check actual improvement vs predicted improvement.
             actual_improvement = objective - objective_0
-            pred_improvement = (
-                0.5
-                * np.linalg.multi_dot(
-                    [delta_0.conj().T, djac_matrix.conj().T, rhs_temp]
-                )[0].real
-            )
+            pred_improvement = 0.5 * delta_0.conj().dot(djac_rhs)[0].real
             improvement_ratio = actual_improvement / pred_improvement
 
             if error_0 < error:
                 # Rescale lambda based on the improvement ratio.
                 _lambda *= max(1 / 3, 1 - (2 * improvement_ratio - 1) ** 3)
-                alpha, B = alpha_0, B_0
+                alpha, B, phi_alpha = alpha_0, B_0, phi_alpha_0
                 residual, objective, error = residual_0, objective_0, error_0
             else:
                 # Increase lambda until something works.
                 for _ in range(maxlam):
                     _lambda *= lamup
                     delta_0, alpha_0 = step(_lambda)
-                    B_0 = compute_B(alpha_0)
+                    phi_alpha_0 = Phi(alpha_0, t)
+                    B_0 = compute_B(phi_alpha_0)
                     residual_0, objective_0, error_0 = compute_error(
-                        B_0, alpha_0
+                        B_0, phi_alpha_0
                     )
 
                     if error_0 < error:
@@ -694,15 +789,9 @@ class BOPDMDOperator(DMDOperator):
                     return B, alpha, converged
 
                 # ...otherwise, update and proceed.
-                alpha, B = alpha_0, B_0
+                alpha, B, phi_alpha = alpha_0, B_0, phi_alpha_0
                 residual, objective, error = residual_0, objective_0, error_0
 
-            # Update SVD information.
-            U, S, Vh = self._compute_irank_svd(Phi(alpha, t), tolrank)
-
-            # Record the current relative error.
-            all_error[itr] = error
-
             # Print iterative progress if the verbose flag is turned on.
             if verbose:
                 update_msg = "Step {} Error {} Lambda {}"
@@ -710,10 +799,9 @@ class BOPDMDOperator(DMDOperator):
 
             # Update termination status and terminate if converged or stalled.
             converged = error < tol
-            error_reduction = all_error[itr - 1] - all_error[itr]
-            stalled = (itr > 0) and (
-                error_reduction < eps_stall * all_error[itr - 1]
-            )
+            error_reduction = prev_error - error
+            stalled = (itr > 0) and (error_reduction < eps_stall * prev_error)
+            prev_error = error
 
             if converged:
                 if verbose:
@@ -731,6 +819,11 @@ class BOPDMDOperator(DMDOperator):
                     print(msg.format(eps_stall, itr + 1, error))
                 return B, alpha, converged
 
+            # Update SVD information, which is only needed by the Jacobian
+            # of the next iteration.
+            if itr < maxiter - 1:
+                U, S, Vh = self._compute_irank_svd(phi_alpha, tolrank)
+
         # Failed to meet tolerance in maxiter steps.
         if verbose:
             msg = (
@@ -741,45 +834,51 @@ class BOPDMDOperator(DMDOperator):
 
         return B, alpha, converged
 
-    def _single_trial_compute_operator(self, H, t, init_alpha):
+    def _single_trial_compute_operator(self, H, t, init_alpha, init_phi=None):
         """
         Helper function that computes the standard optimized dmd operator.
         Returns the resulting DMD modes, eigenvalues, amplitudes, reduced
         system matrix, full system matrix, and whether or not convergence
-        of the variable projection routine was reached.
+        of the variable projection routine was reached. If given, init_phi
+        is the precomputed matrix Phi(init_alpha, t).
         """
         B, alpha, converged = self._variable_projection(
-            H, t, init_alpha, self._exp_function, self._exp_function_deriv
+            H,
+            t,
+            init_alpha,
+            self._exp_function,
+            self._exp_function_deriv,
+            self._exp_function_deriv_batch,
+            init_phi,
         )
         # Save the modes, eigenvalues, and amplitudes respectively.
         w = B.T
         e = alpha
-        b = np.sqrt(np.sum(np.abs(w) ** 2, axis=0))
+        b = np.sqrt(np.einsum("ij,ij->j", w.conj(), w).real)
 
         # Normalize the modes and the amplitudes.
-        inds_small = np.abs(b) < (10 * np.finfo(float).eps * np.max(b))
-        b[inds_small] = 1.0
-        w = w.dot(np.diag(1 / b))
-        w[:, inds_small] = 0.0
+        # Columns with negligible amplitudes are zeroed by the same broadcast
+        # multiply that normalizes the other columns.
+        inds_small = b < (10 * np.finfo(float).eps * np.max(b))
         b[inds_small] = 0.0
+        inv_b = np.divide(1.0, b, out=np.zeros_like(b), where=~inds_small)
+        w = w * inv_b
 
         # Compute the projected propagator Atilde.
         if self._use_proj:
-            Atilde = np.linalg.multi_dot([w, np.diag(e), np.linalg.pinv(w)])
+            Atilde = (w * e).dot(np.linalg.pinv(w))
             # Unproject the dmd modes.
             w = self._proj_basis.dot(w)
             # Apply mode proximal operator if given.
             if self._mode_prox is not None:
                 w = self._mode_prox(w)
         else:
-            w_proj = self._proj_basis.conj().T.dot(w)
-            Atilde = np.linalg.multi_dot(
-                [w_proj, np.diag(e), np.linalg.pinv(w_proj)]
-            )
+            w_proj = self._proj_basis_H.dot(w)
+            Atilde = (w_proj * e).dot(np.linalg.pinv(w_proj))
 
         # Compute the full system matrix A.
         if self._compute_A:
-            A = np.linalg.multi_dot([w, np.diag(e), np.linalg.pinv(w)])
+            A = (w * e).dot(np.linalg.pinv(w))
         else:
             A = None
 
@@ -838,19 +937,31 @@ class BOPDMDOperator(DMDOperator):
         w_sum = np.zeros(w_0.shape, dtype="complex")
         e_sum = np.zeros(e_0.shape, dtype="complex")
         b_sum = np.zeros(b_0.shape, dtype="complex")
-        w_sum2 = np.zeros(w_0.shape, dtype="complex")
-        e_sum2 = np.zeros(e_0.shape, dtype="complex")
-        b_sum2 = np.zeros(b_0.shape, dtype="complex")
+        # Sums of squared magnitudes are real, so store them as such.
+        w_sum2 = np.zeros(w_0.shape)
+        e_sum2 = np.zeros(e_0.shape)
+        b_sum2 = np.zeros(b_0.shape)
 
         # Perform num_trials many successful trials of optimized dmd.
         num_successful_trials = 0
         num_consecutive_fails = 0
         runtime_warning_given = False
 
+        # Every trial starts from e_0, so Phi(e_0, t) only needs to be
+        # evaluated once. Each trial then takes the rows of its own times.
+        if self._eig_constraints:
+            phi_0 = None
+        else:
+            phi_0 = self._exp_function(e_0, t)
+
         while num_successful_trials < self._num_trials:
             H_i, subset_inds = self._bag(H, self._trial_size)
+            if phi_0 is not None:
+                phi_i = phi_0[subset_inds]
+            else:
+                phi_i = None
             trial_optdmd_results = self._single_trial_compute_operator(
-                H_i, t[subset_inds], e_0
+                H_i, t[subset_inds], e_0, phi_i
             )
             w_i, e_i, b_i, _, _, converged = trial_optdmd_results
             if verbose:
@@ -862,16 +973,19 @@ class BOPDMDOperator(DMDOperator):
             # Incorporate trial results into the running average if successful.
             if converged or not self._remove_bad_bags:
                 sorted_inds = self._argsort_eigenvalues(e_i)
+                w_i = w_i[:, sorted_inds]
+                e_i = e_i[sorted_inds]
+                b_i = b_i[sorted_inds]
 
                 # Add to iterative sums.
-                w_sum += w_i[:, sorted_inds]
-                e_sum += e_i[sorted_inds]
-                b_sum += b_i[sorted_inds]
+                w_sum += w_i
+                e_sum += e_i
+                b_sum += b_i
 
                 # Add to iterative sums of squares.
-                w_sum2 += np.abs(w_i[:, sorted_inds]) ** 2
-                e_sum2 += np.abs(e_i[sorted_inds]) ** 2
-                b_sum2 += np.abs(b_i[sorted_inds]) ** 2
+                w_sum2 += w_i.real**2 + w_i.imag**2
+                e_sum2 += e_i.real**2 + e_i.imag**2
+                b_sum2 += b_i.real**2 + b_i.imag**2
 
                 # Bump up the number of successful trials
                 # and reset the consecutive fails counter.
@@ -905,9 +1019,12 @@ class BOPDMDOperator(DMDOperator):
         w_mu = w_sum / self._num_trials
         e_mu = e_sum / self._num_trials
         b_mu = b_sum / self._num_trials
-        w_std = np.sqrt(np.abs(w_sum2 / self._num_trials - np.abs(w_mu) ** 2))
-        e_std = np.sqrt(np.abs(e_sum2 / self._num_trials - np.abs(e_mu) ** 2))
-        b_std = np.sqrt(np.abs(b_sum2 / self._num_trials - np.abs(b_mu) ** 2))
+        w_mu2 = w_mu.real**2 + w_mu.imag**2
+        e_mu2 = e_mu.real**2 + e_mu.imag**2
+        b_mu2 = b_mu.real**2 + b_mu.imag**2
+        w_std = np.sqrt(np.abs(w_sum2 / self._num_trials - w_mu2))
+        e_std = np.sqrt(np.abs(e_sum2 / self._num_trials - e_mu2))
+        b_std = np.sqrt(np.abs(b_sum2 / self._num_trials - b_mu2))
 
         # Save the BOP-DMD statistics.
         self._modes = w_mu
@@ -917,19 +1034,13 @@ class BOPDMDOperator(DMDOperator):
         self._amplitudes_std = b_std
 
         # Compute Atilde using the average optimized dmd results.
-        w_proj = self._proj_basis.conj().T.dot(self._modes)
-        self._Atilde = np.linalg.multi_dot(
-            [w_proj, np.diag(self._eigenvalues), np.linalg.pinv(w_proj)]
-        )
+        w_proj = self._proj_basis_H.dot(self._modes)
+        self._Atilde = (w_proj * self._eigenvalues).dot(np.linalg.pinv(w_proj))
 
         # Compute A if requested.
         if self._compute_A:
-            self._A = np.linalg.multi_dot(
-                [
-                    self._modes,
-                    np.diag(self._eigenvalues),
-                    np.linalg.pinv(self._modes),
-                ]
+            self._A = (self._modes * self._eigenvalues).dot(
+                np.linalg.pinv(self._modes)
             )
 
         return b_mu
@@ -1221,7 +1332,7 @@ class BOPDMD(DMDBase):
         :rtype: numpy.ndarray
         """
         t_omega = np.exp(np.outer(self.eigs, self.time))
-        return np.diag(self.amplitudes).dot(t_omega)
+        return self.amplitudes[:, None] * t_omega
 
     @property
     def amplitudes_std(self):
@@ -1351,17 +1462,17 @@ class BOPDMD(DMDBase):
                     msg = "Invalid eigenvalue constraint combination provided."
                     raise ValueError(msg)
 
-    def _initialize_alpha(self):
+    def _initialize_alpha(self, ux):
         """
         Uses projected trapezoidal rule to approximate the eigenvalues of A in
             z' = Az.
         The computed eigenvalues will serve as our initial guess for alpha.
 
+        :param ux: Snapshot data projected onto the projection basis.
+        :type ux: numpy.ndarray
         :return: Approximated eigenvalues of the matrix A.
         :rtype: numpy.ndarray
         """
-        # Project the snapshot data onto the projection basis.
-        ux = self._proj_basis.conj().T.dot(self.snapshots)
         ux1 = ux[:, :-1]
         ux2 = ux[:, 1:]
 
@@ -1409,25 +1520,35 @@ class BOPDMD(DMDBase):
             )
             raise ValueError(msg)
 
-        # Compute the rank of the fit.
-        self._svd_rank = int(compute_rank(self.snapshots, self._svd_rank))
+        # Compute the rank of the fit and set/check the projection basis.
+        # If no basis was given, a single SVD of the snapshots provides both.
+        if self._proj_basis is None:
+            U, s, _ = compute_svd(self.snapshots, -1)
+            self._svd_rank = int(
+                _compute_rank(s, *self.snapshots.shape, self._svd_rank)
+            )
+            if self._use_proj:
+                self._proj_basis = U[:, : self._svd_rank]
+            else:
+                self._proj_basis = U
+        else:
+            self._svd_rank = int(compute_rank(self.snapshots, self._svd_rank))
+            if (
+                not isinstance(self._proj_basis, np.ndarray)
+                or self._proj_basis.ndim != 2
+                or self._proj_basis.shape[1] != self._svd_rank
+            ):
+                msg = "proj_basis must be a 2D np.ndarray with {} columns."
+                raise ValueError(msg.format(self._svd_rank))
 
-        # Set/check the projection basis.
-        if self._proj_basis is None and self._use_proj:
-            self._proj_basis = compute_svd(self.snapshots, self._svd_rank)[0]
-        elif self._proj_basis is None and not self._use_proj:
-            self._proj_basis = compute_svd(self.snapshots, -1)[0]
-        elif (
-            not isinstance(self._proj_basis, np.ndarray)
-            or self._proj_basis.ndim != 2
-            or self._proj_basis.shape[1] != self._svd_rank
-        ):
-            msg = "proj_basis must be a 2D np.ndarray with {} columns."
-            raise ValueError(msg.format(self._svd_rank))
+        # Project the snapshot data onto the projection basis. This is only
+        # done once, as both the initial alpha and the fit may need it.
+        if self._use_proj or self._init_alpha is None:
+            ux = self._proj_basis.conj().T.dot(self.snapshots)
 
         # Set/check the initial guess for the continuous-time DMD eigenvalues.
         if self._init_alpha is None:
-            self._init_alpha = self._initialize_alpha()
+            self._init_alpha = self._initialize_alpha(ux)
         elif (
             not isinstance(self._init_alpha, np.ndarray)
             or self._init_alpha.ndim > 1
@@ -1456,7 +1577,7 @@ class BOPDMD(DMDBase):
 
         # Define the snapshots that will be used for fitting.
         if self._use_proj:
-            snp = self._proj_basis.conj().T.dot(self.snapshots)
+            snp = ux
         else:
             snp = self.snapshots
 
@@ -1570,6 +1691,8 @@ class BOPDMD(DMDBase):
             that correspond with a complex conjugate pair of eigenvalues.
         :type plot_conjugate_pairs: bool
         """
+        import matplotlib.pyplot as plt
+
         if self.modes_std is None:
             raise ValueError("No UQ metrics to plot.")
 
@@ -1700,6 +1823,7 @@ class BOPDMD(DMDBase):
         :param draw_axes: Whether or not to draw the real and imaginary axes.
         :type draw_axes: bool
         """
+        import matplotlib.pyplot as plt
 
         if self.eigenvalues_std is None:
             raise ValueError("No UQ metrics to plot.")
@@ -320,7 +320,7 @@ and `max_distance_from_unity_outside` can be not `None`"""
             returned by `dmd.dynamics[mode_index]`.
         :return float: the integral contribution of the given DMD mode.
         """
-        return pow(np.linalg.norm(mode), 2) * sum(np.abs(dynamic))
+        return np.vdot(mode, mode).real * np.abs(dynamic).sum()
 
     @staticmethod
     def _integral_contribution(dmd, n):
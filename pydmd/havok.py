@@ -13,9 +13,7 @@ frenet-serret frame, Proceedings of the Royal Society A, 477
 
 import warnings
 import numpy as np
-import matplotlib.pyplot as plt
 
-from matplotlib.gridspec import GridSpec
 from scipy.signal import lsim, StateSpace
 from scipy.stats import norm
 
@@ -564,8 +562,8 @@ class HAVOK:
         if isinstance(p, int):
             # Use Gaussian intersection.
             a = gauss - hy
-            sgn = np.sign(a)
-            ind_signchange = np.where(sgn(a[:-1]) * sgn(a[1:]) > 0)[0]
+            signbit = np.signbit(a)
+            ind_signchange = np.flatnonzero(signbit[:-1] != signbit[1:])
             thres_1 = np.abs(hx[ind_signchange])
             thres_2 = np.abs(hx[ind_signchange + 1])
             threshold_candidates = np.sort(0.5 * (thres_1 + thres_2))
@@ -577,6 +575,8 @@ class HAVOK:
             threshold = 0.5 * (abs(hx[ind1]) + abs(hx[ind2]))
 
         if plot:
+            import matplotlib.pyplot as plt
+
             # Set the plotting parameters first.
             if plot_kwargs is None:
                 plot_kwargs = {}
@@ -654,6 +654,9 @@ class HAVOK:
         :param filename: If specified, the plot is saved at `filename`.
         :type filename: str
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.gridspec import GridSpec
+
         if self._havok_operator is None:
             raise ValueError("You need to call fit().")
 
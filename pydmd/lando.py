@@ -575,17 +575,22 @@ class LANDO(DMDBase):
                 degree = self._kernel_params["degree"]
             else:
                 degree = 3
-            return np.diag(
+            scales = (
                 gamma * degree * (coef0 + gamma * X.T.dot(y)) ** (degree - 1)
-            ).dot(X.T)
+            )
+            return scales[:, None] * X.T
 
         # Kernel metric is RBF.
         centered_X = X - y[..., None]
-        return np.diag(
+        scales = (
             -2
             * gamma
-            * np.exp(-gamma * np.linalg.norm(centered_X, 2, axis=0) ** 2)
-        ).dot(centered_X.T)
+            * np.exp(
+                -gamma
+                * np.einsum("ij,ij->j", centered_X.conj(), centered_X).real
+            )
+        )
+        return scales[:, None] * centered_X.T
 
     @property
     def supported_kernels(self):
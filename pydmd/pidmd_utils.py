@@ -110,20 +110,18 @@ def compute_symmetric(X, Y, svd_rank, skew_symmetric=False):
     U, s, V = compute_svd(X, -1)
     C = np.linalg.multi_dot([U.conj().T, Y, V])
     r = compute_rank(X, svd_rank)
+    s = s[:r]
+    C = C[:r, :r]
+    # Entry (i, j) of atilde is (+-s_i conj(C_ji) + s_j C_ij) / (s_i^2 + s_j^2).
+    # This single expression already gives the (skew-)Hermitian lower
+    # triangle and the purely real (imaginary) diagonal, so the whole matrix
+    # is formed at once by broadcasting.
+    s_col = s[:, None]
     if skew_symmetric:
-        atilde = 1j * np.diag(np.diagonal(C).imag / s)[:r, :r]
-        for i in range(r):
-            for j in range(i + 1, r):
-                atilde[i, j] = -s[i] * np.conj(C[j, i]) + s[j] * C[i, j]
-                atilde[i, j] /= s[i] ** 2 + s[j] ** 2
-        atilde += -atilde.conj().T - 1j * np.diag(np.diag(atilde.imag))
+        atilde = np.subtract(s * C, s_col * C.conj().T, dtype="complex")
     else:  # symmetric
-        atilde = np.diag(np.diagonal(C).real / s)[:r, :r]
-        for i in range(r):
-            for j in range(i + 1, r):
-                atilde[i, j] = s[i] * np.conj(C[j, i]) + s[j] * C[i, j]
-                atilde[i, j] /= s[i] ** 2 + s[j] ** 2
-        atilde += atilde.conj().T - np.diag(np.diag(atilde.real))
+        atilde = (s * C + s_col * C.conj().T).real
+    atilde /= s_col**2 + s**2
     return {"atilde": atilde}
 
 
@@ -223,7 +221,7 @@ def compute_symtridiagonal(X, Y, svd_rank, compute_A):
     """
     # Form the leading block.
     nx = len(X)
-    T1e = np.linalg.norm(X, axis=1) ** 2
+    T1e = np.einsum("ij,ij->i", X.conj(), X).real
     T1 = sparse.diags(T1e)
 
     # Form the second and third blocks.
@@ -297,9 +295,9 @@ def compute_BCCB(X, Y, block_shape, bccb_opt, svd_rank):
     d = np.zeros(nx, dtype="complex")
 
     if not bccb_opt:
-        for j in range(nx):
-            d[j] = np.dot(fX[j], fY[j].conj()).conj()
-            d[j] /= np.linalg.norm(fX[j].conj(), 2) ** 2
+        # Row-wise least squares: d[j] = <fX[j], fY[j]> / ||fX[j]||^2.
+        d = np.einsum("ij,ij->i", fX.conj(), fY)
+        d /= np.einsum("ij,ij->i", fX.conj(), fX).real
     else:
         for j in range(nx):
             dp = np.linalg.lstsq(fX[j, :, None], fY[j, :, None], rcond=None)[0][
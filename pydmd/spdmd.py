@@ -1,7 +1,9 @@
 """Derived module from dmdbase.py for sparsity-promoting DMD."""
 
+from functools import lru_cache
+
 import numpy as np
-from numpy.linalg import solve
+from scipy.linalg import get_lapack_funcs
 from scipy.sparse import csc_matrix as sparse
 from scipy.sparse import hstack as sphstack
 from scipy.sparse import vstack as spvstack
@@ -15,13 +17,33 @@ def soft_thresholding_operator(v, k):
     Soft-thresholding operator as defined in 10.1063/1.4863670.
 
     :param np.ndarray v: The vector on which we apply the operator.
-    :param float k: The threshold.
+    :param k: The threshold. If an array of thresholds is given, the operator
+        is applied for each of them, computing the modulus of `v` only once.
+    :type k: float or np.ndarray
     :return np.ndarray: The result of the application of the soft-tresholding
-        operator on ´v´.
+        operator on ´v´. If `k` is an array, the result has shape
+        `k.shape + v.shape`.
+    """
+    abs_v = np.abs(v)
+    # Append trailing axes to k, so that multiple thresholds broadcast
+    # against v along leading axes.
+    k = np.reshape(k, np.shape(k) + (1,) * abs_v.ndim)
+    mask = abs_v > k
+    scale = np.divide(1 - k, abs_v, out=np.zeros(mask.shape), where=mask)
+    return np.multiply(scale, v)
+
+
+@lru_cache(maxsize=None)
+def _get_potrs(dtype):
     """
-    return np.multiply(
-        np.multiply(np.divide(1 - k, np.abs(v)), v), np.abs(v) > k
-    )
+    Return the LAPACK routine potrs for the given dtype. The routine is cached
+    at module level, so that each ADMM iteration only costs a cache lookup
+    rather than a full `get_lapack_funcs` resolution.
+
+    :param np.dtype dtype: The dtype of the linear system.
+    :return: The LAPACK potrs routine.
+    """
+    return get_lapack_funcs("potrs", dtype=dtype)
 
 
 class SpDMD(DMD):
@@ -135,9 +157,10 @@ class SpDMD(DMD):
 
         self._P = sparse(P)
         self._q = q
-        # Cholesky factorization of matrix P + (rho/2)*I
+        # Cholesky factorization of matrix P + (rho/2)*I. Stored in Fortran
+        # order, so that LAPACK potrs does not copy it at each ADMM iteration.
         Prho = P + np.identity(len(self.amplitudes)) * self.rho / 2
-        self._Plow = np.linalg.cholesky(Prho)
+        self._Plow = np.asfortranarray(np.linalg.cholesky(Prho))
 
         # find which amplitudes are to be set to 0
         zero_amplitudes = self._find_zero_amplitudes()
@@ -166,10 +189,13 @@ class SpDMD(DMD):
         :return: The updated value :math:`\\alpha_{k+1}`.
         :rtype: np.ndarray
         """
-        uk = beta - lmbd / self.rho
-        return solve(
-            self._Plow.conj().T, solve(self._Plow, self._q + uk * self.rho / 2)
-        )
+        # Equal to q + (rho/2) * u_k with u_k = beta - lmbd / rho.
+        rhs = self._q + (self.rho / 2) * beta - lmbd / 2
+        # _Plow is the (lower triangular) Cholesky factor of P + (rho/2)*I,
+        # hence we call LAPACK potrs directly to avoid the (relevant) overhead
+        # of the Python wrappers at each iteration of ADMM.
+        potrs = _get_potrs(np.result_type(self._Plow, rhs))
+        return potrs(self._Plow, rhs, lower=1)[0]
 
     def _update_beta(self, alpha, lmbd):
         """
@@ -229,15 +255,18 @@ class SpDMD(DMD):
             of non-zero amplitudes).
         :return bool: `True` if ADMM can stop now, `False` otherwise.
         """
-        primal_residual = np.linalg.norm(alpha - beta)
-        dual_residual = self.rho * np.linalg.norm(beta - old_beta)
-
-        eps_primal = np.sqrt(len(alpha)) * self._abs_tol + self._rel_tol * max(
-            np.linalg.norm(alpha), np.linalg.norm(beta)
+        # Euclidean norms are computed as sqrt(<v, v>) via np.vdot, which is
+        # much cheaper than np.linalg.norm on the short vectors involved here.
+        primal_diff = alpha - beta
+        dual_diff = beta - old_beta
+        primal_residual = np.sqrt(np.vdot(primal_diff, primal_diff).real)
+        dual_residual = self.rho * np.sqrt(np.vdot(dual_diff, dual_diff).real)
+
+        eps_abs = np.sqrt(len(alpha)) * self._abs_tol
+        eps_primal = eps_abs + self._rel_tol * np.sqrt(
+            max(np.vdot(alpha, alpha).real, np.vdot(beta, beta).real)
         )
-        eps_dual = np.sqrt(
-            len(alpha)
-        ) * self._abs_tol + self._rel_tol * np.linalg.norm(lmbd)
+        eps_dual = eps_abs + self._rel_tol * np.sqrt(np.vdot(lmbd, lmbd).real)
 
         return primal_residual < eps_primal and dual_residual < eps_dual
 
@@ -38,7 +38,7 @@ def _svht(sigma_svd: np.ndarray, rows: int, cols: int) -> int:
     beta = np.divide(*sorted((rows, cols)))
     omega = 0.56 * beta**3 - 0.95 * beta**2 + 1.82 * beta + 1.43
     tau = np.median(sigma_svd) * omega
-    rank = np.sum(sigma_svd > tau)
+    rank = np.count_nonzero(sigma_svd > tau)
 
     if rank == 0:
         warnings.warn(
@@ -447,6 +447,18 @@ def test_bag_int():
     bopdmd.fit(Z, t)
 
 
+def test_bag_small_trial_size():
+    """
+    Test that bagging works when trial_size is smaller than svd_rank, in
+    which case the bagged exponential matrices have more columns than rows.
+    """
+    bopdmd = BOPDMD(svd_rank=2, num_trials=3, trial_size=1)
+    bopdmd.fit(Z, t)
+    assert bopdmd.eigs.shape == (2,)
+    assert np.all(np.isfinite(bopdmd.eigs))
+    assert np.all(np.isfinite(bopdmd.eigenvalues_std))
+
+
 def test_bag_getters():
     """
     Test calls to the num_trials and trial_size parameters.
@@ -641,3 +653,95 @@ def test_getter_errors():
 
     with raises(ValueError):
         _ = bopdmd.amplitudes_std
+
+
+def test_exp_function_deriv_batch():
+    """
+    Test that the batched exponential derivatives agree with the individual
+    derivatives of the matrix of exponentials.
+    """
+    bopdmd = BOPDMD(svd_rank=2)
+    bopdmd.fit(Z, t)
+    op = bopdmd.operator
+    alpha = bopdmd.eigs
+    dphi_all = op._exp_function_deriv_batch(alpha, t)
+    for i in range(len(alpha)):
+        np.testing.assert_allclose(
+            dphi_all[:, i], op._exp_function_deriv(alpha, t, i).toarray()[:, i]
+        )
+
+
+def test_variable_projection_batch_jacobian():
+    """
+    Test that assembling the Jacobian with the batched exponential derivatives
+    gives the same variable projection results as the per-column loop, both
+    with and without the full Jacobian expression.
+    """
+    init_alpha = np.array((-0.05 - 0.9j, 0.05 + 1.1j))
+    H = Z_noisy[:, :1000].T
+    t_fit = t[:1000]
+    for use_fulljac in (True, False):
+        bopdmd = BOPDMD(
+            svd_rank=2,
+            varpro_opts_dict={"use_fulljac": use_fulljac, "maxiter": 1},
+        )
+        bopdmd.fit(Z, t)
+        op = bopdmd.operator
+        B_loop, alpha_loop, _ = op._variable_projection(
+            H,
+            t_fit,
+            init_alpha,
+            op._exp_function,
+            op._exp_function_deriv,
+        )
+        B_batch, alpha_batch, _ = op._variable_projection(
+            H,
+            t_fit,
+            init_alpha,
+            op._exp_function,
+            op._exp_function_deriv,
+            op._exp_function_deriv_batch,
+        )
+        np.testing.assert_allclose(alpha_batch, alpha_loop, rtol=1e-10)
+        np.testing.assert_allclose(B_batch, B_loop, rtol=1e-10)
+
+
+def _run_rank_deficient_varpro(monkeypatch, varpro_opts_dict):
+    """
+    Helper that runs the variable projection routine from an initial alpha
+    with repeated entries, so that Phi(alpha, t) is rank-deficient. Returns
+    the results and the shapes of all matrices passed to np.linalg.lstsq.
+    """
+    bopdmd = BOPDMD(svd_rank=2, varpro_opts_dict=varpro_opts_dict)
+    bopdmd.fit(Z, t)
+    op = bopdmd.operator
+
+    lstsq_shapes = []
+    lstsq = np.linalg.lstsq
+
+    def lstsq_recorder(a, b, **kwargs):
+        lstsq_shapes.append(a.shape)
+        return lstsq(a, b, **kwargs)
+
+    monkeypatch.setattr(np.linalg, "lstsq", lstsq_recorder)
+    results = op._variable_projection(
+        Z[:, :200].T,
+        t[:200],
+        np.array((1j, 1j)),
+        op._exp_function,
+        op._exp_function_deriv,
+        op._exp_function_deriv_batch,
+    )
+    return results, lstsq_shapes
+
+
+def test_variable_projection_rank_deficient_phi(monkeypatch):
+    """
+    Test that B is computed with least squares when Phi is rank-deficient.
+    """
+    (B, alpha, _), lstsq_shapes = _run_rank_deficient_varpro(
+        monkeypatch, {"maxiter": 2}
+    )
+    assert (200, 2) in lstsq_shapes
+    assert np.all(np.isfinite(B))
+    assert np.all(np.isfinite(alpha))
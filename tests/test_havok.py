@@ -373,6 +373,18 @@ def test_threshold_2():
     assert thres_1 == thres_2
 
 
+def test_threshold_int():
+    """
+    Test compute_threshold function.
+    Test that integer values of p index the candidate thresholds located at
+    the intersections of the forcing histogram and the fitted Gaussian.
+    """
+    havok = HAVOK(svd_rank=16, delays=100).fit(x, t)
+    thres_1 = havok.compute_threshold(p=0, bins=100)
+    thres_2 = havok.compute_threshold(p=1, bins=100)
+    assert 0.0 < thres_1 <= thres_2
+
+
 def test_threshold_3():
     """
     Test compute_threshold function.
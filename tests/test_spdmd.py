@@ -3,6 +3,7 @@ import scipy.io
 from pytest import raises
 
 from pydmd import DMD, SpDMD
+from pydmd.spdmd import soft_thresholding_operator
 
 data = np.load("tests/test_datasets/heat_90.npy")
 gammas = [1.0e-1, 0.5, 2, 5, 10, 20, 40, 50, 100]
@@ -321,3 +322,30 @@ def test_correct_amplitudes():
     dmd = SpDMD(release_memory=True, svd_rank=-1)
     dmd.fit(X=data)
     np.testing.assert_array_almost_equal(dmd.amplitudes, dmd._b)
+
+
+def test_soft_thresholding_operator_zero_entries():
+    v = np.array([0.0, 0.1j, 0.5, 2.0, -3.0 + 4.0j])
+    result = soft_thresholding_operator(v, 0.5)
+    assert np.all(np.isfinite(result))
+    np.testing.assert_array_equal(result[np.abs(v) <= 0.5], 0.0)
+
+
+def test_soft_thresholding_operator_multiple_thresholds():
+    v = np.array([0.0, 0.1j, 2.0, -3.0 + 4.0j])
+    ks = np.array([0.05, 0.5, 3.0])
+    batch = soft_thresholding_operator(v, ks)
+    assert batch.shape == (3, 4)
+    for k, row in zip(ks, batch):
+        np.testing.assert_allclose(row, soft_thresholding_operator(v, k))
+
+
+def test_save_load(tmp_path):
+    dmd = SpDMD(svd_rank=10, release_memory=False).fit(data)
+    fname = str(tmp_path / "pydmd.spdmd")
+    dmd.save(fname)
+    loaded_dmd = SpDMD.load(fname)
+    np.testing.assert_array_equal(dmd.amplitudes, loaded_dmd.amplitudes)
+    np.testing.assert_array_equal(
+        dmd.reconstructed_data, loaded_dmd.reconstructed_data
+    )